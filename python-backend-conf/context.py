@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List, Dict, Any
 
 class CustomerBooking(BaseModel):
@@ -32,5 +32,5 @@ class AirlineAgentContext(BaseModel):
     is_conference_attendee: bool = False
     conference_name: Optional[str] = None
 
-    class Config:
-        extra = "allow"  # Allow extra fields for flexibility
\ No newline at end of file
+    # Allow extra fields for flexibility; assignments are not re-validated
+    model_config = ConfigDict(extra="allow", validate_assignment=False, arbitrary_types_allowed=True)
\ No newline at end of file
@@ -6,7 +6,7 @@ logger = logging.getLogger(__name__)
 
 async def create_initial_context() -> AirlineAgentContext:
     """Create an initial empty AirlineAgentContext."""
-    return AirlineAgentContext()
+    return AirlineAgentContext.model_construct()
 
 async def load_user_context(registration_id: str) -> AirlineAgentContext:
     """Load user context from Supabase based on registration_id."""
@@ -17,12 +17,14 @@ async def load_user_context(registration_id: str) -> AirlineAgentContext:
         return ctx
     
     try:
-        response = db_client.table("users").select("id, details").filter("details->>registration_id", "eq", registration_id).execute()
+        response = db_client.table("users").select("id, details").eq("registration_id", registration_id).execute()
         users = response.data
         if users:
             user = users[0]
-            ctx.user_id = user["id"]
-            ctx.registration_id = user["details"].get("registration_id", registration_id)
+            ctx = AirlineAgentContext.model_construct(
+                user_id=user["id"],
+                registration_id=user["details"].get("registration_id", registration_id)
+            )
         logger.info(f"Loaded context: {ctx}")
         return ctx
     except Exception as e:
@@ -42,9 +44,11 @@ async def load_customer_context(account_number: str) -> AirlineAgentContext:
         users = response.data
         if users:
             user = users[0]
-            ctx.user_id = user["id"]
-            ctx.confirmation_number = user.get("confirmation_number")
-            ctx.account_number = user.get("account_number")
+            ctx = AirlineAgentContext.model_construct(
+                user_id=user["id"],
+                confirmation_number=user.get("confirmation_number"),
+                account_number=user.get("account_number")
+            )
         logger.info(f"Loaded context: {ctx}")
         return ctx
     except Exception as e:
@@ -1,8 +1,14 @@
 import os
-from supabase import create_client, Client
+import asyncio
+import asyncpg
+import orjson
 from dotenv import load_dotenv
 import logging
-from typing import Optional, List, Dict, Any
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Callable, Tuple
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
 
@@ -15,16 +21,130 @@ key: str = os.getenv("SUPABASE_ANON_KEY")
 if not url or not key:
     raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
 
-# The actual Supabase client instance
-_raw_supabase_client: Client = create_client(url, key)
+# Optional direct Postgres connection for hot-path lookups
+database_url: Optional[str] = os.getenv("DATABASE_URL")
+
+@cache
+def _get_supabase() -> "Client":
+    """
+    Create the Supabase client on first use.
+
+    supabase pulls in httpx, postgrest, gotrue, storage3 and realtime, so the
+    import is deferred until a query actually needs it.
+    """
+    from supabase import create_client
+    return create_client(url, key)
+
+# Projected user lookup by the indexed registration_id column
+_USER_BY_REGISTRATION_SQL = """
+    SELECT id,
+           details->>'user_name' AS user_name,
+           details->>'email' AS email,
+           details->>'firstName' AS "firstName",
+           details->>'lastName' AS "lastName"
+    FROM users
+    WHERE registration_id = $1
+"""
+
+# Full details blob for GET /user/{registration_id}
+_USER_DETAILS_BY_REGISTRATION_SQL = """
+    SELECT id, details
+    FROM users
+    WHERE registration_id = $1
+"""
+
+# Businesses per industry sector, aggregated in Postgres
+_INDUSTRY_COUNTS_SQL = """
+    SELECT COALESCE(NULLIF(details->>'industrySector', ''), 'Unknown') AS industry,
+           count(*) AS business_count
+    FROM ib_businesses
+    GROUP BY 1
+    ORDER BY business_count DESC
+"""
+
+def _jsonb_eq(key: str) -> Callable:
+    """Filter step for a JSONB path such as ``details->>registration_id``."""
+    return lambda query, value: query.filter(key, "eq", value)
+
+def _column_eq(key: str) -> Callable:
+    """Filter step for a plain column."""
+    return lambda query, value: query.eq(key, value)
+
+@lru_cache(maxsize=256)
+def _compile_query(
+    table_name: str,
+    select_fields: str,
+    filter_keys: Tuple[str, ...],
+    order_by_spec: Tuple[Tuple[str, bool], ...],
+    limit: Optional[int],
+    single: bool
+) -> Callable:
+    """
+    Build a query runner specialised for one query shape.
+
+    Filter keys are classified once per shape, so the returned callable only
+    takes the client and the filter values in ``filter_keys`` order.
+    """
+    filter_steps = tuple(
+        _jsonb_eq(key) if "->" in key else _column_eq(key)
+        for key in filter_keys
+    )
+
+    def run(client: "Client", filter_values: Tuple[Any, ...]):
+        query = client.table(table_name).select(select_fields)
+        for apply_filter, value in zip(filter_steps, filter_values):
+            query = apply_filter(query, value)
+        for column, desc in order_by_spec:
+            query = query.order(column, desc=desc)
+        if limit:
+            query = query.limit(limit)
+
+        response = query.execute()
+
+        if single:
+            return response.data[0] if response.data else None
+        return response.data
+
+    return run
 
 class CustomDatabaseClient:
-    def __init__(self, client: Client):
-        self._client = client
+    def __init__(self, client_factory: Callable[[], "Client"]):
+        self._client_factory = client_factory
+        self._pool: Optional[asyncpg.Pool] = None
+
+    @property
+    def pool(self) -> Optional[asyncpg.Pool]:
+        """The asyncpg pool, or None when DATABASE_URL is not configured."""
+        return self._pool
+
+    async def connect_pool(
+        self,
+        min_size: int = 10,
+        max_size: int = 50,
+        max_inactive_connection_lifetime: float = 300,
+        statement_cache_size: int = 1024
+    ):
+        """Open the asyncpg pool used for hot-path lookups when DATABASE_URL is set."""
+        if self._pool is not None or not database_url:
+            return
+        self._pool = await asyncpg.create_pool(
+            database_url,
+            min_size=min_size,
+            max_size=max_size,
+            max_inactive_connection_lifetime=max_inactive_connection_lifetime,
+            statement_cache_size=statement_cache_size
+        )
+        logger.info(f"Opened asyncpg pool (min_size={min_size}, max_size={max_size})")
+
+    async def close_pool(self):
+        """Close the asyncpg pool if one was opened."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
     
     def table(self, table_name: str):
         """Expose the raw client's table method for direct access."""
-        return self._client.table(table_name)
+        return self._client_factory().table(table_name)
 
     async def query(
         self, 
@@ -47,38 +167,93 @@ class CustomDatabaseClient:
             single: If true, returns the first record or None
         """
         try:
-            query = self._client.table(table_name).select(select_fields)
-            
-            # Apply filters
-            if filters:
-                for key, value in filters.items():
-                    if "->" in key or "->>" in key:
-                        # Handle JSONB filtering
-                        query = query.filter(key, "eq", value)
-                    else:
-                        query = query.eq(key, value)
-            
-            # Apply ordering
-            if order_by:
-                for order in order_by:
-                    column = order.get("column")
-                    ascending = order.get("ascending", True)
-                    query = query.order(column, desc=not ascending)
-            
-            # Apply limit
-            if limit:
-                query = query.limit(limit)
-            
-            # Execute query
-            response = query.execute()
-            
-            if single:
-                return response.data[0] if response.data else None
-            return response.data
+            run = _compile_query(
+                table_name,
+                select_fields,
+                tuple(filters) if filters else (),
+                tuple((order.get("column"), not order.get("ascending", True)) for order in order_by) if order_by else (),
+                limit,
+                single
+            )
+            # supabase-py executes synchronously; run it off the event loop so
+            # concurrent requests (and asyncio.gather'd lookups) actually overlap
+            return await asyncio.to_thread(run, self._client_factory(), tuple(filters.values()) if filters else ())
             
         except Exception as e:
             logger.error(f"Database query error: {e}", exc_info=True)
             raise e
 
+    async def fetch_user_by_registration(self, registration_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the projected user row for a registration ID.
+
+        Uses a prepared statement on the asyncpg pool when available and falls
+        back to PostgREST otherwise. Both paths return the same keys.
+        """
+        if self._pool is None:
+            return await self.query(
+                table_name="users",
+                select_fields="id, details->>user_name, details->>email, details->>firstName, details->>lastName",
+                filters={"registration_id": registration_id},
+                single=True
+            )
+
+        try:
+            row = await self._pool.fetchrow(_USER_BY_REGISTRATION_SQL, registration_id)
+            return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"Database user lookup error: {e}", exc_info=True)
+            raise e
+
+    async def fetch_user_details_by_registration(self, registration_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Fetch the user ID and full details blob for a registration ID.
+
+        Like ``fetch_user_by_registration``, this runs a statement cached on the
+        asyncpg pool when available and falls back to PostgREST otherwise.
+        """
+        if self._pool is None:
+            return await self.query(
+                table_name="users",
+                select_fields="id, details",
+                filters={"registration_id": registration_id},
+                single=True
+            )
+
+        try:
+            row = await self._pool.fetchrow(_USER_DETAILS_BY_REGISTRATION_SQL, registration_id)
+            if not row:
+                return None
+            # asyncpg returns jsonb as text unless a codec is registered
+            return {"id": row["id"], "details": orjson.loads(row["details"]) if row["details"] else None}
+        except Exception as e:
+            logger.error(f"Database user details lookup error: {e}", exc_info=True)
+            raise e
+
+    async def fetch_industry_counts(self) -> List[Tuple[str, int]]:
+        """
+        Count businesses per industry sector, most common first.
+
+        Runs a single GROUP BY on the asyncpg pool when available; the PostgREST
+        fallback fetches only the projected sector and counts in Python.
+        """
+        if self._pool is None:
+            rows = await self.query(
+                table_name="ib_businesses",
+                select_fields="details->>industrySector"
+            )
+            counts: Dict[str, int] = {}
+            for row in rows or ():
+                industry = row.get("industrySector") or "Unknown"
+                counts[industry] = counts.get(industry, 0) + 1
+            return sorted(counts.items(), key=lambda item: item[1], reverse=True)
+
+        try:
+            rows = await self._pool.fetch(_INDUSTRY_COUNTS_SQL)
+            return [(row["industry"], row["business_count"]) for row in rows]
+        except Exception as e:
+            logger.error(f"Database industry count error: {e}", exc_info=True)
+            raise e
+
 # Create the database client instance
-db_client: CustomDatabaseClient = CustomDatabaseClient(_raw_supabase_client)
\ No newline at end of file
+db_client: CustomDatabaseClient = CustomDatabaseClient(_get_supabase)
\ No newline at end of file
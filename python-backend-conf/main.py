@@ -1,10 +1,21 @@
 import os
-from fastapi import FastAPI, HTTPException
+import re
+import json
+import asyncio
+import inspect
+import secrets
+from contextlib import asynccontextmanager
+from functools import singledispatch
+from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Awaitable, Callable, Iterable, List, Tuple
 import logging
 from dotenv import load_dotenv
+from async_lru import alru_cache
+from cachetools import TTLCache
+import msgspec
 
 # Load environment variables
 load_dotenv()
@@ -15,10 +26,16 @@ logger = logging.getLogger(__name__)
 
 # Import context and database
 from context import AirlineAgentContext
-from database import db_client
+from database import db_client, database_url
 
 # Import agents framework
-from agents import Agent, Runner
+from agents import Agent, FunctionTool, OpenAIChatCompletionsModel, RunContextWrapper, Runner, RunResult, set_tracing_disabled
+from openai import AsyncOpenAI
+try:
+    from agents.tool_context import ToolContext
+except ImportError:
+    # Older SDK releases (including the pinned one) pass a plain RunContextWrapper to tools
+    ToolContext = None
 
 # Import tools
 from schedule_agent_tools import (
@@ -40,25 +57,65 @@ from networking_agent_tools import (
     get_industry_breakdown
 )
 
+# Postgres connection budget, split across uvicorn workers
+_DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "60"))
+
+def _worker_count() -> int:
+    """
+    Configured uvicorn worker count.
+
+    With a Postgres pool configured it is capped so every worker gets at least
+    one connection; without DATABASE_URL there is no budget to protect.
+    """
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY") or max(2, os.cpu_count() or 1)))
+    return min(workers, _DB_MAX_CONNECTIONS) if database_url else workers
+
+def _pool_sizes() -> Tuple[int, int]:
+    """Per-worker (min, max) pool sizes keeping all workers within DB_MAX_CONNECTIONS."""
+    per_worker = _DB_MAX_CONNECTIONS // _worker_count()
+    max_size = min(int(os.getenv("DB_POOL_MAX_SIZE", str(per_worker))), per_worker)
+    min_size = min(int(os.getenv("DB_POOL_MIN_SIZE", "2")), max_size)
+    return min_size, max_size
+
+# Database pool lifecycle
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the database connection pool for this worker and close it on shutdown."""
+    min_size, max_size = _pool_sizes()
+    await db_client.connect_pool(
+        min_size=min_size,
+        max_size=max_size,
+        max_inactive_connection_lifetime=300,
+        statement_cache_size=1024
+    )
+    app.state.pool = db_client.pool
+    yield
+    await db_client.close_pool()
+
 # Initialize FastAPI app
-app = FastAPI(title="Conference Agent System", version="1.0.0")
+app = FastAPI(title="Conference Agent System", version="1.0.0", lifespan=lifespan, default_response_class=ORJSONResponse)
 
-# Add CORS middleware
+# Add CORS middleware; origins come from the environment, defaulting to the local UI
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[origin.strip() for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",") if origin.strip()],
+    allow_origin_regex=os.getenv("CORS_ALLOWED_ORIGIN_REGEX") or None,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type"],
 )
 
 # Request/Response models
-class ChatRequest(BaseModel):
+class ChatRequest(msgspec.Struct):
     message: str
     conversation_id: Optional[str] = None
     registration_id: Optional[str] = None
     user_id: Optional[str] = None
 
+# /chat decodes its body with msgspec, so the request schema is published manually
+_CHAT_REQUEST_DECODER = msgspec.json.Decoder(ChatRequest)
+_CHAT_REQUEST_SCHEMA = msgspec.json.schema_components([ChatRequest])[1]["ChatRequest"]
+
 class ChatResponse(BaseModel):
     conversation_id: str
     current_agent: str
@@ -69,40 +126,94 @@ class ChatResponse(BaseModel):
     guardrails: list
     customer_info: Optional[Dict[str, Any]] = None
 
+# Context block of chat responses, picked field by field
+def _context_payload(context: AirlineAgentContext) -> Dict[str, Any]:
+    """Build the context block of a chat response from its known fields."""
+    business_details = context.business_details
+    return {
+        "confirmation_number": context.confirmation_number,
+        "account_number": context.account_number,
+        "registration_id": context.registration_id,
+        "user_id": context.user_id,
+        "business_details": business_details.model_dump(mode="json") if business_details is not None else None,
+        "organization_id": context.organization_id,
+        "user_name": context.user_name,
+        "email": context.email,
+        "is_conference_attendee": context.is_conference_attendee,
+        "conference_name": context.conference_name
+    }
+
 # Define agents
+# The agents run on Groq's OpenAI-compatible endpoint. Without GROQ_API_KEY no
+# configured provider can serve the model, so /chat skips the runner entirely
+_GROQ_API_KEY: Optional[str] = os.getenv("GROQ_API_KEY") or None
+_MODEL: Optional[OpenAIChatCompletionsModel] = (
+    OpenAIChatCompletionsModel(
+        model=os.getenv("GROQ_MODEL", "llama3-8b-8192"),
+        openai_client=AsyncOpenAI(base_url="https://api.groq.com/openai/v1", api_key=_GROQ_API_KEY)
+    )
+    if _GROQ_API_KEY else None
+)
+
+# Traces are exported to OpenAI, which needs its own key
+set_tracing_disabled(not os.getenv("OPENAI_API_KEY"))
+
+_SCHEDULE_INSTRUCTIONS = (
+    "You are the Schedule Agent for the Aviation Tech Summit 2025. Your role is to provide detailed "
+    "conference schedule information including sessions, speakers, tracks, and rooms. "
+    "Use the provided tools to fetch real data from the conference_schedules table. "
+    "Always provide accurate, up-to-date information about the conference. "
+    "If asked about counts, use the appropriate count tools. "
+    "Format your responses clearly and include relevant details like time, location, and speaker information."
+)
+
+_NETWORKING_INSTRUCTIONS = (
+    "You are the Networking Agent for the Aviation Tech Summit 2025. Your role is to help users "
+    "find businesses, manage business profiles, and facilitate networking connections. "
+    "Use the provided tools to fetch real data from the users and ib_businesses tables. "
+    "Provide helpful information about registered businesses, industry breakdowns, and user connections. "
+    "Always use actual data from the database, not made-up information. "
+    "Help users discover networking opportunities and business connections."
+)
+
+_TRIAGE_INSTRUCTIONS = (
+    "You are the Triage Agent for the Aviation Tech Summit 2025 conference system. "
+    "Your role is to understand user queries and provide helpful responses or route them to specialist agents. "
+    "Analyze the user's message to determine intent:\n\n"
+    "For schedule-related queries (sessions, speakers, tracks, rooms, timing), provide helpful information and suggest they can ask specific questions about:\n"
+    "- Conference sessions and schedules\n"
+    "- Speaker information and speaker searches\n"
+    "- Track details and listings\n"
+    "- Room information and locations\n"
+    "- Session topics and content\n\n"
+    "For networking-related queries (businesses, companies, users, industry), provide helpful information and suggest they can ask about:\n"
+    "- Business networking and connections\n"
+    "- Company and business information\n"
+    "- Industry sector questions\n"
+    "- User profiles and business profiles\n\n"
+    "For general greetings or unclear queries, provide a helpful welcome message and guide users toward available services. "
+    "Always be professional and informative."
+)
+
 schedule_agent = Agent(
     name="Schedule Agent",
-    instructions=(
-        "You are the Schedule Agent for the Aviation Tech Summit 2025. Your role is to provide detailed "
-        "conference schedule information including sessions, speakers, tracks, and rooms. "
-        "Use the provided tools to fetch real data from the conference_schedules table. "
-        "Always provide accurate, up-to-date information about the conference. "
-        "If asked about counts, use the appropriate count tools. "
-        "Format your responses clearly and include relevant details like time, location, and speaker information."
-    ),
+    instructions=_SCHEDULE_INSTRUCTIONS,
     tools=[
         get_conference_sessions,
         get_all_speakers,
-        get_all_tracks, 
+        get_all_tracks,
         get_all_rooms,
         search_sessions_by_speaker,
         search_sessions_by_topic,
         get_session_count,
         get_speaker_count
     ],
-    model="groq/llama3-8b-8192"
+    model=_MODEL
 )
 
 networking_agent = Agent(
-    name="Networking Agent", 
-    instructions=(
-        "You are the Networking Agent for the Aviation Tech Summit 2025. Your role is to help users "
-        "find businesses, manage business profiles, and facilitate networking connections. "
-        "Use the provided tools to fetch real data from the users and ib_businesses tables. "
-        "Provide helpful information about registered businesses, industry breakdowns, and user connections. "
-        "Always use actual data from the database, not made-up information. "
-        "Help users discover networking opportunities and business connections."
-    ),
+    name="Networking Agent",
+    instructions=_NETWORKING_INSTRUCTIONS,
     tools=[
         search_businesses,
         get_user_businesses,
@@ -111,329 +222,556 @@ networking_agent = Agent(
         search_users_by_name,
         get_industry_breakdown
     ],
-    model="groq/llama3-8b-8192"
+    model=_MODEL
 )
 
 triage_agent = Agent(
     name="Triage Agent",
-    instructions=(
-        "You are the Triage Agent for the Aviation Tech Summit 2025 conference system. "
-        "Your role is to understand user queries and provide helpful responses or route them to specialist agents. "
-        "Analyze the user's message to determine intent:\n\n"
-        "For schedule-related queries (sessions, speakers, tracks, rooms, timing), provide helpful information and suggest they can ask specific questions about:\n"
-        "- Conference sessions and schedules\n"
-        "- Speaker information and speaker searches\n"
-        "- Track details and listings\n"
-        "- Room information and locations\n"
-        "- Session topics and content\n\n"
-        "For networking-related queries (businesses, companies, users, industry), provide helpful information and suggest they can ask about:\n"
-        "- Business networking and connections\n"
-        "- Company and business information\n"
-        "- Industry sector questions\n"
-        "- User profiles and business profiles\n\n"
-        "For general greetings or unclear queries, provide a helpful welcome message and guide users toward available services. "
-        "Always be professional and informative."
-    ),
+    instructions=_TRIAGE_INSTRUCTIONS,
     tools=[],
-    model="groq/llama3-8b-8192"
+    model=_MODEL
 )
 
+# Static agent metadata returned with every chat response
+_AGENTS_META = [
+    {
+        "name": "Triage Agent",
+        "description": "Routes queries to appropriate specialists",
+        "handoffs": ["Schedule Agent", "Networking Agent"],
+        "tools": [],
+        "input_guardrails": []
+    },
+    {
+        "name": "Schedule Agent",
+        "description": "Conference schedule and speaker information",
+        "handoffs": ["Triage Agent"],
+        "tools": ["get_conference_sessions", "get_all_speakers", "get_all_tracks"],
+        "input_guardrails": []
+    },
+    {
+        "name": "Networking Agent",
+        "description": "Business networking and connections",
+        "handoffs": ["Triage Agent"],
+        "tools": ["search_businesses", "get_user_businesses", "get_business_count"],
+        "input_guardrails": []
+    }
+]
+
+# Request-agnostic part of every chat response; handlers only add the dynamic fields
+_CHAT_RESPONSE_TEMPLATE = {
+    "events": [],
+    "agents": _AGENTS_META,
+    "guardrails": []
+}
+
+# Cached user lookup
+_REGISTRATION_ID_PATTERN = re.compile(r"[A-Za-z0-9_\-]{4,64}")
+
+# Registration IDs that recently matched no user, so junk traffic skips the DB
+_missing_registrations: TTLCache = TTLCache(maxsize=1024, ttl=300)
+
+def _is_valid_registration_id(registration_id: Optional[str]) -> bool:
+    """Cheap format check run before any registration lookup."""
+    return bool(registration_id) and _REGISTRATION_ID_PATTERN.fullmatch(registration_id) is not None
+
+# User info is effectively immutable for the length of a session
+@alru_cache(maxsize=4096, ttl=300)
+async def _lookup_user_by_registration(registration_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the user row for a registration ID, cached per attendee."""
+    return await db_client.fetch_user_by_registration(registration_id)
+
+@alru_cache(maxsize=4096, ttl=300)
+async def _lookup_user_details(registration_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the user row with its full details blob, cached per attendee."""
+    return await db_client.fetch_user_details_by_registration(registration_id)
+
+async def _fetch_user_by_registration(registration_id: str) -> Optional[Dict[str, Any]]:
+    """Fetch the user row for a registration ID, short-circuiting known misses."""
+    if not _is_valid_registration_id(registration_id) or registration_id in _missing_registrations:
+        return None
+    
+    user_data = await _lookup_user_by_registration(registration_id)
+    if user_data is None:
+        _missing_registrations[registration_id] = True
+    return user_data
+
 # Create context function
-async def create_context(registration_id: Optional[str] = None) -> AirlineAgentContext:
-    """Create and populate context based on registration ID."""
-    context = AirlineAgentContext()
+async def _load_user(registration_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Fetch the user row for a registration ID, logging rather than raising on failure."""
+    if not _is_valid_registration_id(registration_id):
+        return None
     
-    if registration_id:
-        try:
-            # Try to load user data
-            user_data = await db_client.query(
-                table_name="users",
-                select_fields="id, details",
-                filters={"details->>registration_id": registration_id},
-                single=True
-            )
-            
-            if user_data:
-                context.user_id = user_data["id"]
-                context.registration_id = registration_id
-                details = user_data.get("details", {})
-                context.user_name = details.get("user_name")
-                context.email = details.get("email")
-                context.is_conference_attendee = True
-                context.conference_name = "Aviation Tech Summit 2025"
-                logger.info(f"Loaded context for registration_id: {registration_id}")
-            else:
-                logger.warning(f"No user found for registration_id: {registration_id}")
-                
-        except Exception as e:
-            logger.error(f"Error loading user context: {e}")
+    try:
+        user_data = await _fetch_user_by_registration(registration_id)
+    except Exception as e:
+        logger.error("Error loading user context: %s", e)
+        return None
     
-    return context
+    if not user_data:
+        logger.warning("No user found for registration_id: %s", registration_id)
+    return user_data
 
-# Route determination
-def determine_agent(message: str) -> Agent:
-    """Determine which agent should handle the message."""
-    message_lower = message.lower()
-    
-    # Schedule-related keywords
-    schedule_keywords = [
-        'session', 'sessions', 'speaker', 'speakers', 'schedule', 'agenda',
-        'track', 'tracks', 'room', 'rooms', 'conference', 'talk', 'talks',
-        'presentation', 'presentations', 'topic', 'topics', 'time', 'when',
-        'how many sessions', 'how many speakers', 'session count', 'speaker count'
-    ]
+def _context_from_user(registration_id: Optional[str], user_data: Optional[Dict[str, Any]]) -> AirlineAgentContext:
+    """Build the agent context from an already fetched user row."""
+    if not user_data:
+        return AirlineAgentContext.model_construct()
     
-    # Networking-related keywords  
-    networking_keywords = [
-        'business', 'businesses', 'company', 'companies', 'networking',
-        'industry', 'sector', 'user', 'users', 'profile', 'profiles',
-        'connect', 'connection', 'directory', 'how many users', 'how many businesses',
-        'business count', 'user count', 'industry breakdown'
-    ]
+    # Rows come from our own users table, so skip field validation
+    logger.debug("Loaded context for registration_id: %s", registration_id)
+    return AirlineAgentContext.model_construct(
+        user_id=user_data["id"],
+        registration_id=registration_id,
+        user_name=user_data.get("user_name"),
+        email=user_data.get("email"),
+        is_conference_attendee=True,
+        conference_name="Aviation Tech Summit 2025"
+    )
+
+async def create_context(registration_id: Optional[str] = None) -> AirlineAgentContext:
+    """Create and populate context based on registration ID."""
+    return _context_from_user(registration_id, await _load_user(registration_id))
+
+# Route determination
+# Schedule-related keywords
+schedule_keywords = (
+    'session', 'sessions', 'speaker', 'speakers', 'schedule', 'agenda',
+    'track', 'tracks', 'room', 'rooms', 'conference', 'talk', 'talks',
+    'presentation', 'presentations', 'topic', 'topics', 'time', 'when',
+    'how many sessions', 'how many speakers', 'session count', 'speaker count'
+)
+
+# Networking-related keywords
+networking_keywords = (
+    'business', 'businesses', 'company', 'companies', 'networking',
+    'industry', 'sector', 'user', 'users', 'profile', 'profiles',
+    'connect', 'connection', 'directory', 'how many users', 'how many businesses',
+    'business count', 'user count', 'industry breakdown'
+)
+
+def _compile_keywords(keywords: Iterable[str]) -> re.Pattern:
+    """Compile a keyword list into a single alternation, longest keywords first."""
+    return re.compile("|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True)))
+
+# Whole-token membership answers most messages. Routing keeps the original
+# substring semantics ("schedules", "conferences", "username" all match), so
+# anything the token check misses goes through one compiled scan per category.
+# Every multi-word keyword contains a single-word one, so words alone suffice
+_TOKEN_PATTERN = re.compile(r"[a-z]+")
+_SCHEDULE_WORDS = frozenset(keyword for keyword in schedule_keywords if " " not in keyword)
+_NETWORKING_WORDS = frozenset(keyword for keyword in networking_keywords if " " not in keyword)
+_SCHEDULE_SCAN = _compile_keywords(_SCHEDULE_WORDS)
+_NETWORKING_SCAN = _compile_keywords(_NETWORKING_WORDS)
+
+def determine_agent(message_lower: str) -> Agent:
+    """Determine which agent should handle the (already casefolded) message."""
+    tokens = set(_TOKEN_PATTERN.findall(message_lower))
     
     # Check for schedule keywords
-    if any(keyword in message_lower for keyword in schedule_keywords):
+    if not tokens.isdisjoint(_SCHEDULE_WORDS) or _SCHEDULE_SCAN.search(message_lower):
         return schedule_agent
         
     # Check for networking keywords
-    if any(keyword in message_lower for keyword in networking_keywords):
+    if not tokens.isdisjoint(_NETWORKING_WORDS) or _NETWORKING_SCAN.search(message_lower):
         return networking_agent
     
     # Default to triage for unclear queries
     return triage_agent
 
+# Manual-handler intents
+class _IntentMatcher:
+    """
+    Map keyword phrases to intents, checking intents in priority order.
+
+    ``table`` lists ``(intent, phrases)`` pairs in priority order; the first
+    intent with any phrase in the message wins, matching the original ``elif``
+    chains. Each intent gets its own compiled alternation, so an overlapping
+    phrase from a lower-priority intent cannot hide a higher-priority one.
+    """
+
+    def __init__(self, table: List[Tuple[str, Tuple[str, ...]]]):
+        self._table = [(intent, phrases, _compile_keywords(phrases)) for intent, phrases in table]
+
+    def match(self, message_lower: str) -> Optional[Tuple[str, str]]:
+        """Return the ``(intent, phrase)`` of the highest-priority match, if any."""
+        for intent, phrases, pattern in self._table:
+            if pattern.search(message_lower):
+                # Report the first listed phrase present, as the original loops did
+                return intent, next(phrase for phrase in phrases if phrase in message_lower)
+        return None
+
+_TRIAGE_INTENTS = _IntentMatcher([
+    ("greeting", ('hello', 'hi', 'hey', 'welcome', 'start')),
+    ("schedule_help", ('session', 'speaker', 'schedule', 'track', 'room')),
+    ("networking_help", ('business', 'company', 'networking', 'industry', 'user')),
+])
+
+_SCHEDULE_INTENTS = _IntentMatcher([
+    ("all_sessions", ('all sessions', 'list sessions')),
+    ("all_speakers", ('all speakers', 'list speakers')),
+    ("all_tracks", ('all tracks', 'list tracks')),
+    ("all_rooms", ('all rooms', 'list rooms')),
+    ("session_count", ('how many sessions', 'session count')),
+    ("speaker_count", ('how many speakers', 'speaker count')),
+    ("sessions_by_speaker", ('sessions by', 'speaker')),
+    ("sessions_by_topic", ('topic', 'about')),
+])
+
+_NETWORKING_INTENTS = _IntentMatcher([
+    ("all_businesses", ('all businesses', 'list businesses')),
+    ("business_count", ('how many businesses', 'business count')),
+    ("user_count", ('how many users', 'user count')),
+    ("industry_breakdown", ('industry breakdown',)),
+    ("find_user", ('find user', 'search user')),
+    ("industry", ('fintech', 'tech', 'healthcare', 'finance')),
+])
+
+# Direct tool invocation outside an agent run
+async def _invoke_tool(tool: Any, *args: Any, context: Optional[AirlineAgentContext] = None) -> Any:
+    """
+    Call a tool with positional arguments, outside an agent run.
+
+    ``@function_tool`` wraps the tool coroutines in FunctionTool objects, which
+    are not callable; those are invoked through ``on_invoke_tool`` with the
+    arguments mapped onto the tool's parameter names in declaration order.
+    """
+    if not isinstance(tool, FunctionTool):
+        return await tool(*args)
+    
+    arguments = json.dumps(dict(zip(tool.params_json_schema.get("properties", {}), args)))
+    if ToolContext is None:
+        tool_context = RunContextWrapper(context=context)
+    else:
+        tool_context = ToolContext(context=context, tool_name=tool.name, tool_call_id="direct", tool_arguments=arguments)
+    return await tool.on_invoke_tool(tool_context, arguments)
+
+# Conference metadata changes on the order of minutes, so the argument-free
+# read-only tools are served from a short TTL cache (one DB read per window)
+
+# Tools report failures as replies rather than raising (their own "Error ..."
+# strings, or the SDK's default tool error message); those must not be cached
+_TOOL_ERROR_PREFIXES = ("Error ", "An error occurred while running the tool")
+
+class _UncachedReply(Exception):
+    """Carries a tool's error reply out of its cache wrapper, since alru_cache never caches exceptions."""
+
+def _cached_tool(tool: FunctionTool) -> Callable[[], Awaitable[str]]:
+    """Wrap an argument-free tool in a single-entry TTL cache that skips error replies."""
+    @alru_cache(maxsize=1, ttl=120)
+    async def cached() -> str:
+        reply = str(await _invoke_tool(tool))
+        if reply.startswith(_TOOL_ERROR_PREFIXES):
+            raise _UncachedReply(reply)
+        return reply
+    
+    async def call() -> str:
+        try:
+            return await cached()
+        except _UncachedReply as e:
+            return e.args[0]
+    
+    call.cache_clear = cached.cache_clear
+    return call
+
+_cached_all_speakers = _cached_tool(get_all_speakers)
+_cached_all_tracks = _cached_tool(get_all_tracks)
+_cached_all_rooms = _cached_tool(get_all_rooms)
+_cached_session_count = _cached_tool(get_session_count)
+_cached_speaker_count = _cached_tool(get_speaker_count)
+_cached_business_count = _cached_tool(get_business_count)
+_cached_user_count = _cached_tool(get_user_count)
+_cached_industry_breakdown = _cached_tool(get_industry_breakdown)
+
+# Everything cleared by POST /cache/clear
+_CLEARABLE_CACHES = (
+    _cached_all_speakers,
+    _cached_all_tracks,
+    _cached_all_rooms,
+    _cached_session_count,
+    _cached_speaker_count,
+    _cached_business_count,
+    _cached_user_count,
+    _cached_industry_breakdown,
+    _lookup_user_by_registration,
+    _lookup_user_details,
+)
+
+# Manual tool dispatch: intent -> (tool, argument extractor or None)
+def _text_after(pattern: re.Pattern) -> Callable[[str, str], Optional[str]]:
+    """Build an extractor returning the text captured after a phrase in the original message."""
+    def extract(message: str, phrase: str) -> Optional[str]:
+        found = pattern.search(message)
+        return found.group(1).strip() if found else None
+    return extract
+
+def _matched_phrase(message: str, phrase: str) -> str:
+    """Use the matched keyword itself as the tool argument."""
+    return phrase
+
+_SCHEDULE_DISPATCH = {
+    "all_sessions": (get_conference_sessions, None),
+    "all_speakers": (_cached_all_speakers, None),
+    "all_tracks": (_cached_all_tracks, None),
+    "all_rooms": (_cached_all_rooms, None),
+    "session_count": (_cached_session_count, None),
+    "speaker_count": (_cached_speaker_count, None),
+    "sessions_by_speaker": (search_sessions_by_speaker, _text_after(re.compile(r"(?:sessions by|speakers?)\s+(.+)", re.IGNORECASE))),
+    "sessions_by_topic": (search_sessions_by_topic, _text_after(re.compile(r"(?:topics?|about)\s+(.+)", re.IGNORECASE))),
+}
+
+_NETWORKING_DISPATCH = {
+    "all_businesses": (search_businesses, None),
+    "business_count": (_cached_business_count, None),
+    "user_count": (_cached_user_count, None),
+    "industry_breakdown": (_cached_industry_breakdown, None),
+    "find_user": (search_users_by_name, _text_after(re.compile(r"(?:find|search) users?\s+(.+)", re.IGNORECASE))),
+    "industry": (search_businesses, _matched_phrase),
+}
+
+def _manual_routes(agent: Agent) -> Optional[Tuple["_IntentMatcher", Dict[str, Tuple[Any, Any]], Any]]:
+    """Return the (intents, dispatch, default tool) tables for a specialist agent."""
+    if agent == schedule_agent:
+        return _SCHEDULE_INTENTS, _SCHEDULE_DISPATCH, get_conference_sessions
+    if agent == networking_agent:
+        return _NETWORKING_INTENTS, _NETWORKING_DISPATCH, search_businesses
+    return None
+
+def _match_exact_tool(agent: Agent, message_lower: str) -> Optional[Any]:
+    """Return the argument-free tool that fully answers the message, if one matches."""
+    routes = _manual_routes(agent)
+    if routes is None:
+        return None
+    
+    intents, dispatch, _ = routes
+    matched = intents.match(message_lower)
+    if matched is None:
+        return None
+    
+    tool, extract_argument = dispatch[matched[0]]
+    return tool if extract_argument is None else None
+
+async def _call_exact_tool(tool: Any) -> Optional[Any]:
+    """Answer from an argument-free tool, returning None so the caller falls back to the agent run."""
+    try:
+        return await _invoke_tool(tool)
+    except Exception:
+        logger.debug("Direct tool call failed, using agent run", exc_info=True)
+        return None
+
+# Canned triage replies used when the agent runner is unavailable
+_GREETING_RESPONSE = (
+    "Welcome to the Aviation Tech Summit 2025! 🛩️\n\n"
+    "I'm here to help you with:\n\n"
+    "**📅 Conference Information:**\n"
+    "• Session schedules and timings\n"
+    "• Speaker information and bios\n"
+    "• Track details and topics\n"
+    "• Room locations and layouts\n\n"
+    "**🤝 Business Networking:**\n"
+    "• Find businesses and companies\n"
+    "• Industry sector information\n"
+    "• User profiles and connections\n"
+    "• Networking opportunities\n\n"
+    "What would you like to know about the conference?"
+)
+
+_SCHEDULE_GUIDANCE = (
+    "I can help you with conference schedule information! You can ask me about:\n\n"
+    "• **Sessions:** \"Show me all sessions\" or \"Sessions by [speaker name]\"\n"
+    "• **Speakers:** \"List all speakers\" or \"How many speakers?\"\n"
+    "• **Tracks:** \"What tracks are available?\" or \"Show me track information\"\n"
+    "• **Rooms:** \"List conference rooms\" or \"Where is [session] located?\"\n"
+    "• **Topics:** \"Sessions about [topic]\" or \"Find sessions on AI\"\n\n"
+    "What specific information would you like?"
+)
+
+_NETWORKING_GUIDANCE = (
+    "I can help you with business networking and connections! You can ask me about:\n\n"
+    "• **Businesses:** \"Show me businesses\" or \"Companies in [industry]\"\n"
+    "• **Industries:** \"Industry breakdown\" or \"Fintech companies\"\n"
+    "• **Users:** \"How many users?\" or \"Find user [name]\"\n"
+    "• **Networking:** \"Business directory\" or \"Connect with [industry]\"\n\n"
+    "What networking information are you looking for?"
+)
+
+_DEFAULT_RESPONSE = (
+    "I'm here to help you with the Aviation Tech Summit 2025! 🛩️\n\n"
+    "You can ask me about:\n"
+    "• **Conference schedules** - sessions, speakers, tracks, rooms\n"
+    "• **Business networking** - companies, industries, user connections\n\n"
+    "Try asking something like:\n"
+    "• \"Show me all sessions\"\n"
+    "• \"List all speakers\"\n"
+    "• \"Find businesses in fintech\"\n"
+    "• \"How many users are registered?\"\n\n"
+    "What would you like to know?"
+)
+
+_TRIAGE_RESPONSES = {
+    "greeting": _GREETING_RESPONSE,
+    "schedule_help": _SCHEDULE_GUIDANCE,
+    "networking_help": _NETWORKING_GUIDANCE
+}
+
+# Response content extraction
+@singledispatch
+def _extract_response_content(response: Any) -> str:
+    """Extract the reply text from whatever the agent call returned."""
+    output = getattr(response, "output", None)
+    return output if output is not None else str(response)
+
+@_extract_response_content.register
+def _(response: str) -> str:
+    return response
+
+@_extract_response_content.register
+def _(response: dict) -> str:
+    return response.get("output", str(response))
+
+@_extract_response_content.register
+def _(response: RunResult) -> str:
+    return str(response.final_output)
+
 # Initialize runner
 runner = Runner()
 
+def _resolve_run_impl() -> Optional[Callable[[Agent, str, AirlineAgentContext], Awaitable[Any]]]:
+    """Pick the agent call pattern supported by the installed agents SDK."""
+    run_parameters = inspect.signature(runner.run).parameters
+    if "starting_agent" in run_parameters:
+        return lambda agent, message, context: runner.run(agent, message, context=context)
+    if "agent" in run_parameters:
+        return lambda agent, message, context: runner.run(message, agent=agent, context=context)
+    if hasattr(Agent, "run"):
+        return lambda agent, message, context: agent.run(message, context=context)
+    return None
+
+# Resolved once so requests don't probe call patterns by raising exceptions;
+# without a model provider every run would fail, so go straight to the manual handlers
+_RUN_IMPL = _resolve_run_impl() if _MODEL is not None else None
+
 # Chat endpoint
-@app.post("/chat", response_model=ChatResponse)
-async def chat_endpoint(request: ChatRequest):
+@app.post(
+    "/chat",
+    response_class=ORJSONResponse,
+    responses={
+        200: {"model": ChatResponse},
+        422: {
+            "description": "Validation Error",
+            "content": {"application/json": {"schema": {"$ref": "#/components/schemas/HTTPValidationError"}}}
+        }
+    },
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": _CHAT_REQUEST_SCHEMA}}
+        }
+    }
+)
+async def chat_endpoint(raw_request: Request):
     """Handle chat requests and route to appropriate agent."""
     try:
-        logger.info(f"Received message: {request.message}")
+        request = _CHAT_REQUEST_DECODER.decode(await raw_request.body())
+    except msgspec.DecodeError as e:
+        # Same detail shape as FastAPI's own request validation errors
+        raise HTTPException(status_code=422, detail=[{"loc": ["body"], "msg": str(e), "type": "value_error"}])
+    
+    try:
+        logger.info("Received message: %s", request.message)
         
-        # Create context
-        context = await create_context(request.registration_id)
+        # Casefold once and share it with every routing/matching step
+        message_lower = request.message.casefold()
         
         # Determine which agent to use
-        selected_agent = determine_agent(request.message)
-        logger.info(f"Selected agent: {selected_agent.name}")
+        selected_agent = determine_agent(message_lower)
+        logger.debug("Selected agent: %s", selected_agent.name)
         
-        # Try different runner call patterns based on the agents framework
-        try:
-            # Pattern 1: Simple message and context
-            response = await runner.run(request.message, context=context)
-        except Exception as e1:
-            logger.warning(f"Pattern 1 failed: {e1}")
+        # Fully structured queries ("how many sessions", "all speakers", ...)
+        # are answered by their tool directly, skipping the LLM round trip.
+        # Those tools don't need the context, so the call overlaps the user lookup
+        exact_tool = _match_exact_tool(selected_agent, message_lower)
+        if exact_tool is not None:
+            user_data, response = await asyncio.gather(
+                _load_user(request.registration_id),
+                _call_exact_tool(exact_tool)
+            )
+        else:
+            user_data, response = await _load_user(request.registration_id), None
+        
+        context = _context_from_user(request.registration_id, user_data)
+        
+        # Run the agent through the call pattern resolved at import, falling
+        # back to calling tools directly if the SDK call is unavailable or fails
+        if response is None and _RUN_IMPL is not None:
             try:
-                # Pattern 2: With agent parameter
-                response = await runner.run(request.message, agent=selected_agent, context=context)
-            except Exception as e2:
-                logger.warning(f"Pattern 2 failed: {e2}")
-                try:
-                    # Pattern 3: Direct agent run
-                    response = await selected_agent.run(request.message, context=context)
-                except Exception as e3:
-                    logger.warning(f"Pattern 3 failed: {e3}")
-                    # Pattern 4: Manual response for triage
-                    if selected_agent == triage_agent:
-                        response = await handle_triage_manually(request.message, context)
-                    else:
-                        # Try to call agent tools directly
-                        response = await handle_agent_manually(selected_agent, request.message, context)
+                response = await _RUN_IMPL(selected_agent, request.message, context)
+            except Exception:
+                logger.debug("Agent run failed, using manual handler", exc_info=True)
+        
+        if response is None:
+            if selected_agent == triage_agent:
+                response = await handle_triage_manually(request.message, message_lower, context)
+            else:
+                # Try to call agent tools directly
+                response = await handle_agent_manually(selected_agent, request.message, message_lower, context)
         
         # Extract response content
-        response_content = ""
-        if hasattr(response, 'output'):
-            response_content = response.output
-        elif isinstance(response, dict):
-            response_content = response.get('output', str(response))
-        else:
-            response_content = str(response)
+        response_content = _extract_response_content(response)
         
-        # Get customer info if registration_id provided
+        # Get customer info from the same user row the context was built from
         customer_info = None
-        if request.registration_id:
-            try:
-                user_data = await db_client.query(
-                    table_name="users",
-                    select_fields="id, details",
-                    filters={"details->>registration_id": request.registration_id},
-                    single=True
-                )
-                
-                if user_data:
-                    details = user_data.get("details", {})
-                    customer_info = {
-                        "customer": {
-                            "name": details.get("user_name", f"{details.get('firstName', '')} {details.get('lastName', '')}").strip(),
-                            "email": details.get("email"),
-                            "registration_id": request.registration_id,
-                            "is_conference_attendee": True,
-                            "conference_name": "Aviation Tech Summit 2025"
-                        },
-                        "bookings": []
-                    }
-            except Exception as e:
-                logger.error(f"Error fetching customer info: {e}")
+        if user_data:
+            customer_info = {
+                "customer": {
+                    "name": (user_data.get("user_name") or f"{user_data.get('firstName') or ''} {user_data.get('lastName') or ''}").strip(),
+                    "email": user_data.get("email"),
+                    "registration_id": request.registration_id,
+                    "is_conference_attendee": True,
+                    "conference_name": "Aviation Tech Summit 2025"
+                },
+                "bookings": []
+            }
         
-        # Format response
-        return ChatResponse(
-            conversation_id=request.conversation_id or "new_conversation",
-            current_agent=selected_agent.name,
-            messages=[{
+        # Format response; returning the Response directly also skips the
+        # jsonable_encoder pass FastAPI applies to plain dict returns
+        return ORJSONResponse({
+            **_CHAT_RESPONSE_TEMPLATE,
+            "conversation_id": request.conversation_id or "new_conversation",
+            "current_agent": selected_agent.name,
+            "messages": [{
                 "content": response_content,
                 "agent": selected_agent.name
             }],
-            events=[],
-            context=context.dict(),
-            agents=[
-                {
-                    "name": "Triage Agent",
-                    "description": "Routes queries to appropriate specialists",
-                    "handoffs": ["Schedule Agent", "Networking Agent"],
-                    "tools": [],
-                    "input_guardrails": []
-                },
-                {
-                    "name": "Schedule Agent", 
-                    "description": "Conference schedule and speaker information",
-                    "handoffs": ["Triage Agent"],
-                    "tools": ["get_conference_sessions", "get_all_speakers", "get_all_tracks"],
-                    "input_guardrails": []
-                },
-                {
-                    "name": "Networking Agent",
-                    "description": "Business networking and connections", 
-                    "handoffs": ["Triage Agent"],
-                    "tools": ["search_businesses", "get_user_businesses", "get_business_count"],
-                    "input_guardrails": []
-                }
-            ],
-            guardrails=[],
-            customer_info=customer_info
-        )
+            "context": _context_payload(context),
+            "customer_info": customer_info
+        })
         
     except Exception as e:
-        logger.error(f"Error in chat endpoint: {e}", exc_info=True)
+        logger.error("Error in chat endpoint: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
-async def handle_triage_manually(message: str, context: AirlineAgentContext) -> str:
+async def handle_triage_manually(message: str, message_lower: str, context: AirlineAgentContext) -> str:
     """Handle triage agent responses manually."""
-    message_lower = message.lower()
-    
-    # Greeting responses
-    if any(word in message_lower for word in ['hello', 'hi', 'hey', 'welcome', 'start']):
-        return (
-            f"Welcome to the Aviation Tech Summit 2025! 🛩️\n\n"
-            f"I'm here to help you with:\n\n"
-            f"**📅 Conference Information:**\n"
-            f"• Session schedules and timings\n"
-            f"• Speaker information and bios\n"
-            f"• Track details and topics\n"
-            f"• Room locations and layouts\n\n"
-            f"**🤝 Business Networking:**\n"
-            f"• Find businesses and companies\n"
-            f"• Industry sector information\n"
-            f"• User profiles and connections\n"
-            f"• Networking opportunities\n\n"
-            f"What would you like to know about the conference?"
-        )
-    
-    # Schedule-related guidance
-    elif any(word in message_lower for word in ['session', 'speaker', 'schedule', 'track', 'room']):
-        return (
-            f"I can help you with conference schedule information! You can ask me about:\n\n"
-            f"• **Sessions:** \"Show me all sessions\" or \"Sessions by [speaker name]\"\n"
-            f"• **Speakers:** \"List all speakers\" or \"How many speakers?\"\n"
-            f"• **Tracks:** \"What tracks are available?\" or \"Show me track information\"\n"
-            f"• **Rooms:** \"List conference rooms\" or \"Where is [session] located?\"\n"
-            f"• **Topics:** \"Sessions about [topic]\" or \"Find sessions on AI\"\n\n"
-            f"What specific information would you like?"
-        )
-    
-    # Networking-related guidance
-    elif any(word in message_lower for word in ['business', 'company', 'networking', 'industry', 'user']):
-        return (
-            f"I can help you with business networking and connections! You can ask me about:\n\n"
-            f"• **Businesses:** \"Show me businesses\" or \"Companies in [industry]\"\n"
-            f"• **Industries:** \"Industry breakdown\" or \"Fintech companies\"\n"
-            f"• **Users:** \"How many users?\" or \"Find user [name]\"\n"
-            f"• **Networking:** \"Business directory\" or \"Connect with [industry]\"\n\n"
-            f"What networking information are you looking for?"
-        )
-    
-    # Default response
-    else:
-        return (
-            f"I'm here to help you with the Aviation Tech Summit 2025! 🛩️\n\n"
-            f"You can ask me about:\n"
-            f"• **Conference schedules** - sessions, speakers, tracks, rooms\n"
-            f"• **Business networking** - companies, industries, user connections\n\n"
-            f"Try asking something like:\n"
-            f"• \"Show me all sessions\"\n"
-            f"• \"List all speakers\"\n"
-            f"• \"Find businesses in fintech\"\n"
-            f"• \"How many users are registered?\"\n\n"
-            f"What would you like to know?"
-        )
-
-async def handle_agent_manually(agent: Agent, message: str, context: AirlineAgentContext) -> str:
+    matched = _TRIAGE_INTENTS.match(message_lower)
+    return _TRIAGE_RESPONSES.get(matched[0], _DEFAULT_RESPONSE) if matched else _DEFAULT_RESPONSE
+
+async def handle_agent_manually(agent: Agent, message: str, message_lower: str, context: AirlineAgentContext) -> str:
     """Handle agent responses manually by calling tools directly."""
-    message_lower = message.lower()
+    routes = _manual_routes(agent)
+    if routes is None:
+        return f"I understand you're asking about {message}, but I need more specific information to help you."
     
-    if agent == schedule_agent:
-        # Handle schedule-related queries
-        if 'all sessions' in message_lower or 'list sessions' in message_lower:
-            return await get_conference_sessions()
-        elif 'all speakers' in message_lower or 'list speakers' in message_lower:
-            return await get_all_speakers()
-        elif 'all tracks' in message_lower or 'list tracks' in message_lower:
-            return await get_all_tracks()
-        elif 'all rooms' in message_lower or 'list rooms' in message_lower:
-            return await get_all_rooms()
-        elif 'how many sessions' in message_lower or 'session count' in message_lower:
-            return await get_session_count()
-        elif 'how many speakers' in message_lower or 'speaker count' in message_lower:
-            return await get_speaker_count()
-        elif 'sessions by' in message_lower or 'speaker' in message_lower:
-            # Extract speaker name
-            words = message.split()
-            speaker_name = " ".join(words[2:]) if len(words) > 2 else ""
-            if speaker_name:
-                return await search_sessions_by_speaker(speaker_name)
-        elif 'topic' in message_lower or 'about' in message_lower:
-            # Extract topic
-            words = message.split()
-            topic = " ".join(words[1:]) if len(words) > 1 else ""
-            if topic:
-                return await search_sessions_by_topic(topic)
-        else:
-            return await get_conference_sessions()
+    intents, dispatch, default_tool = routes
+    matched = intents.match(message_lower)
+    if matched is None:
+        return await _invoke_tool(default_tool, context=context)
     
-    elif agent == networking_agent:
-        # Handle networking-related queries
-        if 'all businesses' in message_lower or 'list businesses' in message_lower:
-            return await search_businesses()
-        elif 'how many businesses' in message_lower or 'business count' in message_lower:
-            return await get_business_count()
-        elif 'how many users' in message_lower or 'user count' in message_lower:
-            return await get_user_count()
-        elif 'industry breakdown' in message_lower:
-            return await get_industry_breakdown()
-        elif 'find user' in message_lower or 'search user' in message_lower:
-            # Extract user name
-            words = message.split()
-            user_name = " ".join(words[2:]) if len(words) > 2 else ""
-            if user_name:
-                return await search_users_by_name(user_name)
-        elif any(industry in message_lower for industry in ['fintech', 'tech', 'healthcare', 'finance']):
-            # Extract industry
-            for industry in ['fintech', 'tech', 'healthcare', 'finance']:
-                if industry in message_lower:
-                    return await search_businesses(industry_sector=industry)
-        else:
-            return await search_businesses()
+    tool, extract_argument = dispatch[matched[0]]
+    if extract_argument is None:
+        return await _invoke_tool(tool, context=context)
+    
+    argument = extract_argument(message, matched[1])
+    if argument:
+        return await _invoke_tool(tool, argument, context=context)
     
     return f"I understand you're asking about {message}, but I need more specific information to help you."
 
@@ -443,17 +781,31 @@ async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "message": "Conference Agent System is running"}
 
+# Cache refresh endpoint, restricted to callers holding ADMIN_TOKEN
+_ADMIN_TOKEN: Optional[str] = os.getenv("ADMIN_TOKEN") or None
+
+@app.post("/cache/clear")
+async def clear_caches(authorization: Optional[str] = Header(None)):
+    """Drop cached tool results and user lookups so the next request re-reads the DB."""
+    if _ADMIN_TOKEN is None:
+        raise HTTPException(status_code=403, detail="Cache clearing is disabled")
+    if not authorization or not secrets.compare_digest(authorization.encode(), f"Bearer {_ADMIN_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+    
+    for cached in _CLEARABLE_CACHES:
+        cached.cache_clear()
+    _missing_registrations.clear()
+    return {"status": "cleared"}
+
 # User endpoint
 @app.get("/user/{registration_id}")
 async def get_user(registration_id: str):
     """Get user information by registration ID."""
+    if not _is_valid_registration_id(registration_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    
     try:
-        user_data = await db_client.query(
-            table_name="users",
-            select_fields="id, details",
-            filters={"details->>registration_id": registration_id},
-            single=True
-        )
+        user_data = await _lookup_user_details(registration_id)
         
         if user_data:
             return {
@@ -468,9 +820,26 @@ async def get_user(registration_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching user: {e}")
+        logger.error("Error fetching user: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Workers read WEB_CONCURRENCY to size their pools, so publish the capped count
+    workers = _worker_count()
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    # uvicorn counts idle keep-alive connections toward limit_concurrency, so it
+    # stays unlimited unless explicitly configured
+    limit_concurrency = os.getenv("LIMIT_CONCURRENCY")
+    # Multiple workers require the import string form of the app
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=int(limit_concurrency) if limit_concurrency else None,
+        backlog=int(os.getenv("BACKLOG", "2048")),
+        log_level=os.getenv("LOG_LEVEL", "warning")
+    )
\ No newline at end of file
@@ -0,0 +1,10 @@
+-- Promote details->>'registration_id' to an indexed generated column.
+-- Every /chat and /user/{registration_id} call filters users on this key;
+-- without an index PostgREST falls back to a full JSONB scan of the table.
+
+ALTER TABLE users
+    ADD COLUMN IF NOT EXISTS registration_id text
+    GENERATED ALWAYS AS (details->>'registration_id') STORED;
+
+CREATE UNIQUE INDEX IF NOT EXISTS users_registration_id_key
+    ON users (registration_id);
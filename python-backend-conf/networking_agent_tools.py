@@ -119,28 +119,22 @@ async def get_user_businesses(user_id: str) -> str:
 async def get_business_count() -> str:
     """Get the total number of registered businesses."""
     try:
+        # One projected read serves both the count and the breakdowns
         businesses = await db_client.query(
             table_name="ib_businesses",
-            select_fields="id"
+            select_fields="details->>industrySector, details->>location"
         )
         
         count = len(businesses) if businesses else 0
         result = f"**Total Registered Businesses:** {count}"
         
         if count > 0:
-            # Get additional stats
-            full_businesses = await db_client.query(
-                table_name="ib_businesses",
-                select_fields="details"
-            )
-            
             industries = {}
             locations = {}
             
-            for business in full_businesses:
-                details = business.get("details", {})
-                industry = details.get("industrySector", "Unknown")
-                location = details.get("location", "Unknown")
+            for business in businesses:
+                industry = business.get("industrySector") or "Unknown"
+                location = business.get("location") or "Unknown"
                 
                 industries[industry] = industries.get(industry, 0) + 1
                 locations[location] = locations.get(location, 0) + 1
@@ -187,43 +181,37 @@ async def get_user_count() -> str:
 async def search_users_by_name(search_term: str, limit: Optional[int] = 10) -> str:
     """Search for users by name or email."""
     try:
+        # Project only the searched/displayed fields instead of the full details blob
         users = await db_client.query(
             table_name="users",
-            select_fields="id, details"
+            select_fields="id, registration_id, details->>user_name, details->>email, details->>firstName, details->>lastName"
         )
         
         if not users:
             return "No users found in the database."
         
         # Filter users based on search term
+        term = search_term.lower()
         matching_users = []
         for user in users:
-            details = user.get("details", {})
-            user_name = details.get("user_name", "")
-            email = details.get("email", "")
-            first_name = details.get("firstName", "")
-            last_name = details.get("lastName", "")
-            
-            if (search_term.lower() in user_name.lower() or
-                search_term.lower() in email.lower() or
-                search_term.lower() in first_name.lower() or
-                search_term.lower() in last_name.lower()):
+            if (term in (user.get("user_name") or "").lower() or
+                term in (user.get("email") or "").lower() or
+                term in (user.get("firstName") or "").lower() or
+                term in (user.get("lastName") or "").lower()):
                 matching_users.append(user)
-        
-        if limit:
-            matching_users = matching_users[:limit]
+                if limit and len(matching_users) >= limit:
+                    break
         
         if not matching_users:
             return f"No users found matching search term: {search_term}"
         
         result = f"**Found {len(matching_users)} user(s) matching '{search_term}':**\n\n"
         for i, user in enumerate(matching_users, 1):
-            details = user.get("details", {})
-            name = details.get("user_name") or f"{details.get('firstName', '')} {details.get('lastName', '')}".strip()
+            name = user.get("user_name") or f"{user.get('firstName') or ''} {user.get('lastName') or ''}".strip()
             result += (
                 f"{i}. **{name or 'Unknown Name'}**\n"
-                f"   Email: {details.get('email', 'N/A')}\n"
-                f"   Registration ID: {details.get('registration_id', 'N/A')}\n\n"
+                f"   Email: {user.get('email') or 'N/A'}\n"
+                f"   Registration ID: {user.get('registration_id') or 'N/A'}\n\n"
             )
         
         logger.info(f"✅ Found {len(matching_users)} users matching: {search_term}")
@@ -239,33 +227,19 @@ async def search_users_by_name(search_term: str, limit: Optional[int] = 10) -> s
 async def get_industry_breakdown() -> str:
     """Get a breakdown of businesses by industry sector."""
     try:
-        businesses = await db_client.query(
-            table_name="ib_businesses",
-            select_fields="details"
-        )
+        sorted_industries = await db_client.fetch_industry_counts()
         
-        if not businesses:
+        if not sorted_industries:
             return "No businesses found in the database."
         
-        industry_counts = {}
-        for business in businesses:
-            details = business.get("details", {})
-            industry = details.get("industrySector", "Unknown")
-            industry_counts[industry] = industry_counts.get(industry, 0) + 1
-        
-        if not industry_counts:
-            return "No industry data found."
-        
-        result = f"**Industry Breakdown ({len(businesses)} total businesses):**\n\n"
-        
-        # Sort by count (descending)
-        sorted_industries = sorted(industry_counts.items(), key=lambda x: x[1], reverse=True)
+        total = sum(count for _, count in sorted_industries)
+        result = f"**Industry Breakdown ({total} total businesses):**\n\n"
         
         for industry, count in sorted_industries:
-            percentage = (count / len(businesses)) * 100
+            percentage = (count / total) * 100
             result += f"• **{industry}:** {count} businesses ({percentage:.1f}%)\n"
         
-        logger.info(f"✅ Retrieved industry breakdown for {len(businesses)} businesses")
+        logger.info(f"✅ Retrieved industry breakdown for {total} businesses")
         return result
     except Exception as e:
         logger.error(f"❌ Error getting industry breakdown: {e}", exc_info=True)
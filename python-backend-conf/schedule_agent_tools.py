@@ -235,9 +235,10 @@ async def search_sessions_by_topic(topic_keyword: str) -> str:
 async def get_session_count() -> str:
     """Get the total number of conference sessions."""
     try:
+        # One read serves both the count and the unique-value stats
         sessions = await db_client.query(
             table_name="conference_schedules",
-            select_fields="id"
+            select_fields="speaker_name, track_name, conference_room_name"
         )
         
         count = len(sessions) if sessions else 0
@@ -250,12 +251,7 @@ async def get_session_count() -> str:
             unique_tracks = set()
             unique_rooms = set()
             
-            full_sessions = await db_client.query(
-                table_name="conference_schedules",
-                select_fields="speaker_name, track_name, conference_room_name"
-            )
-            
-            for session in full_sessions:
+            for session in sessions:
                 if session.get('speaker_name'):
                     unique_speakers.add(session['speaker_name'])
                 if session.get('track_name'):
@@ -0,0 +1,46 @@
+"""
+Optional build step that compiles the per-request modules with Cython.
+
+The plain .py sources stay the source of truth; the compiled extensions are
+picked up ahead of them by the normal import system when present.
+
+Usage:
+    pip install "cython>=3.0"
+    python setup_cython.py build_ext --inplace
+
+An in-place build finishes by importing the compiled context module and
+validating an AirlineAgentContext, so a build whose models no longer validate
+fails here rather than at request time.
+"""
+import sys
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+
+def _verify_compiled_context():
+    """Check that the compiled context module is the one imported and still validates."""
+    import importlib.machinery
+    import context
+
+    if not context.__file__.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)):
+        sys.exit(f"context imported from {context.__file__}, not the compiled extension")
+
+    ctx = context.AirlineAgentContext.model_validate(
+        {"registration_id": "REG-0001", "is_conference_attendee": True}
+    )
+    if ctx.registration_id != "REG-0001" or ctx.is_conference_attendee is not True:
+        sys.exit("compiled AirlineAgentContext did not validate as expected")
+    print(f"verified compiled AirlineAgentContext from {context.__file__}")
+
+
+setup(
+    name="conference-agent-backend-ext",
+    ext_modules=cythonize(
+        ["context.py", "database.py"],
+        compiler_directives={"language_level": 3},
+    ),
+)
+
+if "build_ext" in sys.argv and ("--inplace" in sys.argv or "-i" in sys.argv):
+    _verify_compiled_context()
@@ -0,0 +1,8 @@
+import os
+import sys
+
+# main and database read these at import; the routing tests never reach Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost")
+os.environ.setdefault("SUPABASE_ANON_KEY", "test-anon-key")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,23 @@
+import pytest
+
+import main
+
+
+@pytest.mark.parametrize("matcher, message, expected", [
+    # "find user" starts before, and overlaps, the higher-priority "user count"
+    (main._NETWORKING_INTENTS, "find user count", ("user_count", "user count")),
+    (main._NETWORKING_INTENTS, "search users count", ("find_user", "search user")),
+    (main._SCHEDULE_INTENTS, "show all sessions by speaker bob", ("all_sessions", "all sessions")),
+    (main._SCHEDULE_INTENTS, "speaker count please", ("speaker_count", "speaker count")),
+])
+def test_highest_priority_intent_wins_over_overlapping_phrases(matcher, message, expected):
+    assert matcher.match(message) == expected
+
+
+def test_industry_phrase_follows_list_order():
+    # The original loop checked sectors in list order, not message order
+    assert main._NETWORKING_INTENTS.match("healthcare or fintech firms") == ("industry", "fintech")
+
+
+def test_no_match_returns_none():
+    assert main._SCHEDULE_INTENTS.match("what is the weather") is None
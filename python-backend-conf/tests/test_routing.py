@@ -0,0 +1,42 @@
+import pytest
+
+import main
+
+SAMPLE_MESSAGES = [
+    "Show me the schedules",
+    "What conferences are there?",
+    "Any connections for me?",
+    "what sectors are represented",
+    "When does the keynote start?",
+    "list all sessions",
+    "how many speakers are there",
+    "Who is talking about AI?",
+    "mushroom risotto recipes",
+    "Sometimes I wonder",
+    "find user Alice",
+    "What's your username policy?",
+    "Reconnecting with old colleagues",
+    "Show me fintech companies",
+    "industry breakdown please",
+    "How many businesses registered?",
+    "Tell me about the directory",
+    "Hello there",
+    "hi",
+    "thanks!",
+    "",
+]
+
+
+def _baseline_route(message: str) -> str:
+    """The original substring routing, kept as the reference behaviour."""
+    message_lower = message.lower()
+    if any(keyword in message_lower for keyword in main.schedule_keywords):
+        return main.schedule_agent.name
+    if any(keyword in message_lower for keyword in main.networking_keywords):
+        return main.networking_agent.name
+    return main.triage_agent.name
+
+
+@pytest.mark.parametrize("message", SAMPLE_MESSAGES)
+def test_determine_agent_matches_substring_routing(message):
+    assert main.determine_agent(message.casefold()).name == _baseline_route(message)